@@ -3,6 +3,15 @@ from synergy_dataset._version import __version_tuple__  # noqa
 from synergy_dataset.base import Dataset
 from synergy_dataset.base import download_raw_dataset
 from synergy_dataset.base import download_raw_subset
+from synergy_dataset.base import export_merged
+from synergy_dataset.base import get_session
 from synergy_dataset.base import iter_datasets
 
-__all__ = ["Dataset", "download_raw_dataset", "download_raw_subset", "iter_datasets"]
+__all__ = [
+    "Dataset",
+    "download_raw_dataset",
+    "download_raw_subset",
+    "export_merged",
+    "get_session",
+    "iter_datasets",
+]
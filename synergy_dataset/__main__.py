@@ -12,6 +12,7 @@ from synergy_dataset.base import Dataset
 from synergy_dataset.base import _dataset_available
 from synergy_dataset.base import _get_path_raw_dataset
 from synergy_dataset.base import download_raw_dataset
+from synergy_dataset.base import export_merged
 from synergy_dataset.base import iter_datasets
 
 LEGAL_NOTE = """
@@ -95,6 +96,12 @@ def build_dataset(argv):
         default=None,
         help="Dataset name.",
     )
+    parser.add_argument(
+        "-m",
+        "--merged",
+        help="Export all datasets to a single CSV file with a 'dataset' column.",
+        action="store_true",
+    )
     parser.add_argument(
         "-l",
         "--ignore-legal",
@@ -131,6 +138,22 @@ def build_dataset(argv):
     if args.legal:
         print("Building dataset")
 
+        if args.merged:
+            output = Path(args.output).with_suffix(".csv")
+
+            if output.exists():
+                print(f"File '{output}' already exists")
+                exit(1)
+
+            if args.dataset is not None:
+                datasets = [Dataset(name) for name in args.dataset]
+            else:
+                datasets = list(iter_datasets())
+
+            output.parent.mkdir(exist_ok=True, parents=True)
+            export_merged(output, tqdm(datasets), variables=args.vars)
+            return
+
         if Path(args.output).exists() and any(Path(args.output).iterdir()):
             print(f"Folder '{args.output}' is not empty")
             exit(1)
@@ -1,13 +1,14 @@
 import csv
 import glob
+import hashlib
 import json
 import os
 import zipfile
-from io import BytesIO
 from pathlib import Path
 
 import requests
-import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import pandas as pd
@@ -23,9 +24,112 @@ SYNERGY_VERSION = (
 )
 SYNERGY_PATH = os.getenv("SYNERGY_PATH")
 SYNERGY_ROOT = Path("~", ".synergy_dataset_source").expanduser()
+SYNERGY_CACHE = Path(os.getenv("SYNERGY_CACHE", Path(SYNERGY_ROOT, ".cache")))
+SYNERGY_TIMEOUT = float(os.getenv("SYNERGY_TIMEOUT", 60))
+SYNERGY_RETRIES = int(os.getenv("SYNERGY_RETRIES", 5))
 
-# Initialize requests-cache with a 24-hour expiration
-requests_cache.install_cache("synergy_cache", expire_after=24 * 60 * 60)
+RETRY_STATUS = [429, 500, 502, 503, 504]
+
+_session = None
+
+
+def get_session(retries=None, backoff_factor=0.5, pool_maxsize=10):
+    """Create a session with connection pooling and retries.
+
+    Args:
+        retries (int, optional): Number of retries on connection errors and
+        transient responses (429 and 5xx). Defaults to SYNERGY_RETRIES.
+        backoff_factor (float, optional): Factor for the exponential backoff
+        between retries. Default 0.5.
+        pool_maxsize (int, optional): Number of connections to keep alive
+        per host. Default 10.
+
+    Returns:
+        requests.Session: Session object
+    """
+    retry = Retry(
+        total=SYNERGY_RETRIES if retries is None else retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=["HEAD", "GET"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_session():
+    global _session
+
+    if _session is None:
+        _session = get_session()
+    return _session
+
+
+def _download(url, session=None, timeout=None, cache_dir=None):
+    """Download a file to the cache, revalidating earlier downloads.
+
+    The ETag and Last-Modified headers of the response are stored next to
+    the file. Subsequent downloads of the same URL send these validators
+    and reuse the cached file if the server responds with 304 Not Modified.
+
+    Args:
+        url (str): URL of the file.
+        session (requests.Session, optional): Session to use. Defaults to a
+        shared session with retries.
+        timeout (float, optional): Timeout in seconds. Defaults to
+        SYNERGY_TIMEOUT.
+        cache_dir (str, optional): Folder to cache the downloads in.
+        Defaults to SYNERGY_CACHE.
+
+    Returns:
+        pathlib.Path: Path to the downloaded file
+    """
+    session = _get_session() if session is None else session
+    timeout = SYNERGY_TIMEOUT if timeout is None else timeout
+    cache_dir = Path(SYNERGY_CACHE if cache_dir is None else cache_dir)
+
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    fp = Path(cache_dir, key)
+    fp_headers = Path(cache_dir, f"{key}.json")
+
+    headers = {}
+    if fp.exists() and fp_headers.exists():
+        with open(fp_headers, encoding="utf-8") as f:
+            validators = json.load(f)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304 and headers:
+            return fp
+        r.raise_for_status()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fp_tmp = Path(cache_dir, f"{key}.tmp")
+        with open(fp_tmp, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+        os.replace(fp_tmp, fp)
+
+        with open(fp_headers, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "url": url,
+                    "etag": r.headers.get("ETag"),
+                    "last_modified": r.headers.get("Last-Modified"),
+                },
+                f,
+            )
+
+    return fp
 
 
 def _get_path_raw_dataset(version=None):
@@ -62,7 +166,9 @@ def _dataset_available(version=SYNERGY_VERSION):
     return _get_path_raw_dataset(version=version).exists()
 
 
-def download_raw_dataset(url=None, path=SYNERGY_ROOT, version=None, source="dataverse"):
+def download_raw_dataset(
+    url=None, path=SYNERGY_ROOT, version=None, source="dataverse", session=None
+):
     """Download the raw dataset from the SYNERGY repository.
 
     Args:
@@ -73,17 +179,16 @@ def download_raw_dataset(url=None, path=SYNERGY_ROOT, version=None, source="data
         version (str, optional): The version of the dataset to download.
         source (str, optional): The source to download (github, dataverse).
         Default dataverse.
+        session (requests.Session, optional): Session to download with.
+        Defaults to a shared session with retries.
     """
     if url is None:
         url = _get_download_url(version=version, source=source)
 
     print(f"Downloading version {SYNERGY_VERSION} of the SYNERGY dataset...")
 
-    response = requests.get(url)
-    response.raise_for_status()
-
-    release_zip = zipfile.ZipFile(BytesIO(response.content))
-    release_zip.extractall(path=path)
+    with zipfile.ZipFile(_download(url, session=session)) as release_zip:
+        release_zip.extractall(path=path)
 
     # hack because the version on dataverse has a v prefix
     for f in Path(path).iterdir():
@@ -91,7 +196,7 @@ def download_raw_dataset(url=None, path=SYNERGY_ROOT, version=None, source="data
             os.rename(f, str(f).replace("synergy-dataset-v", "synergy-dataset-"))
 
 
-def download_raw_subset(name, path=SYNERGY_ROOT, version=None):
+def download_raw_subset(name, path=SYNERGY_ROOT, version=None, session=None):
     """Download the raw dataset from the SYNERGY repository.
 
     Args:
@@ -102,13 +207,15 @@ def download_raw_subset(name, path=SYNERGY_ROOT, version=None):
         version (str, optional): The version of the dataset to download.
         source (str, optional): The source to download (github, dataverse).
         Default dataverse.
+        session (requests.Session, optional): Session to download with.
+        Defaults to a shared session with retries.
     """
 
     version = SYNERGY_VERSION if version is None else version
     url_list = f"https://dataverse.nl/api/datasets/:persistentId/versions/{version}?persistentId=doi:10.34894/HE6NAQ"  # noqa
 
-    r = requests.get(url_list)
-    file_list = r.json()["data"]["files"]
+    with open(_download(url_list, session=session), encoding="utf-8") as f:
+        file_list = json.load(f)["data"]["files"]
 
     files_subset = filter(
         lambda x: x["directoryLabel"] == f"synergy-dataset-v1.0/{name}", file_list
@@ -116,7 +223,7 @@ def download_raw_subset(name, path=SYNERGY_ROOT, version=None):
     ids = ",".join(str(x["dataFile"]["id"]) for x in files_subset)
 
     url_download = f"https://dataverse.nl/api/access/datafiles/{ids}"
-    download_raw_dataset(url=url_download, path=path)
+    download_raw_dataset(url=url_download, path=path, session=session)
 
 
 def iter_datasets(path=None, version=None):
@@ -148,6 +255,35 @@ def iter_datasets(path=None, version=None):
         yield Dataset(Path(dataset).parts[-2], path=Path(dataset).parent)
 
 
+def export_merged(fp, datasets=None, variables=WORK_MAPPING):
+    """Export multiple datasets to a single CSV file.
+
+    The records are written one work set at a time, without building a
+    DataFrame per dataset. The column 'dataset' holds the dataset name.
+
+    Args:
+        fp (str): Path of the CSV file to write to.
+        datasets (iterable, optional): Dataset objects to export. Defaults
+        to all datasets.
+        variables (list, optional): List of variables to export.
+        Defaults to WORK_MAPPING.
+    """
+    if datasets is None:
+        datasets = iter_datasets()
+
+    fieldnames = ["dataset", "openalex_id", *variables, "label_included"]
+
+    with open(fp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for dataset in datasets:
+            writer.writerows(
+                {"dataset": dataset.name, "openalex_id": openalex_id, **record}
+                for openalex_id, record in dataset.iter_records(variables)
+            )
+
+
 class Dataset:
     """Dataset object belonging to a systematic review."""
 
@@ -244,17 +380,16 @@ class Dataset:
                         for di in d:
                             yield Work(di), self.labels[di["id"]]
 
-    def to_dict(self, variables=WORK_MAPPING):
-        """Export the dataset to a dictionary.
+    def iter_records(self, variables=WORK_MAPPING):
+        """Iterate over the records in the dataset.
 
         Args:
             variables (list, optional): List of variables to export.
             Defaults to WORK_MAPPING.
 
-        Returns:
-            dict: Dictionary of the dataset
+        Yields:
+            tuple: OpenAlex identifier, record
         """
-        records = {k: None for k, v in self.labels.items()}
         for work, label_included in self.iter():
             if isinstance(variables, dict):
                 record = {}
@@ -279,7 +414,21 @@ class Dataset:
                 )
 
             record["label_included"] = label_included
-            records[work["id"]] = record
+            yield work["id"], record
+
+    def to_dict(self, variables=WORK_MAPPING):
+        """Export the dataset to a dictionary.
+
+        Args:
+            variables (list, optional): List of variables to export.
+            Defaults to WORK_MAPPING.
+
+        Returns:
+            dict: Dictionary of the dataset
+        """
+        records = {k: None for k, v in self.labels.items()}
+        for openalex_id, record in self.iter_records(variables):
+            records[openalex_id] = record
 
         return records
 
@@ -0,0 +1,99 @@
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+import requests
+
+from synergy_dataset import download_raw_dataset
+from synergy_dataset import get_session
+from synergy_dataset.base import _download
+
+ETAG = '"synergy-test"'
+
+
+def _release_zip():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("synergy-dataset-v1.0/Test_2023/labels.csv", "openalex_id\n")
+    return buffer.getvalue()
+
+
+class DataverseHandler(BaseHTTPRequestHandler):
+    content = _release_zip()
+    requests = []
+    failures = 0
+
+    def do_GET(self):
+        DataverseHandler.requests.append(self.headers.get("If-None-Match"))
+
+        if DataverseHandler.failures > 0:
+            DataverseHandler.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(self.content)))
+            self.end_headers()
+            self.wfile.write(self.content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    DataverseHandler.requests = []
+    DataverseHandler.failures = 0
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), DataverseHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/release.zip"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_revalidate(server, tmpdir):
+    session = get_session(backoff_factor=0)
+
+    fp = _download(server, session=session, cache_dir=tmpdir)
+    fp_cached = _download(server, session=session, cache_dir=tmpdir)
+
+    assert fp == fp_cached
+    assert fp.read_bytes() == DataverseHandler.content
+    assert DataverseHandler.requests == [None, ETAG]
+
+
+def test_download_retry(server, tmpdir):
+    DataverseHandler.failures = 2
+
+    fp = _download(server, session=get_session(backoff_factor=0), cache_dir=tmpdir)
+
+    assert fp.read_bytes() == DataverseHandler.content
+    assert len(DataverseHandler.requests) == 3
+
+
+def test_download_retry_exhausted(server, tmpdir):
+    DataverseHandler.failures = 5
+
+    with pytest.raises(requests.HTTPError):
+        _download(
+            server, session=get_session(retries=1, backoff_factor=0), cache_dir=tmpdir
+        )
+
+
+def test_download_raw_dataset_local(server, tmpdir, monkeypatch):
+    monkeypatch.setattr("synergy_dataset.base.SYNERGY_CACHE", tmpdir / "cache")
+
+    download_raw_dataset(url=server, path=tmpdir, session=get_session(backoff_factor=0))
+
+    assert (tmpdir / "synergy-dataset-1.0" / "Test_2023" / "labels.csv").exists()
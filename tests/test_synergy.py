@@ -1,6 +1,12 @@
+import csv
+import json
+import zipfile
+from pathlib import Path
+
 import pytest
 
 from synergy_dataset import Dataset
+from synergy_dataset import export_merged
 from synergy_dataset import iter_datasets
 from synergy_dataset.base import download_raw_subset
 
@@ -37,3 +43,56 @@ def test_download_single_dataset(dataset_name, tmpdir):
 
     with pytest.raises(StopIteration):
         next(datasets)
+
+
+def _write_dataset(path, name, works):
+    p = Path(path, name)
+    p.mkdir(parents=True)
+
+    with open(Path(p, "labels.csv"), "w", encoding="utf-8") as f:
+        f.write("openalex_id,label_included\n")
+        for i, work in enumerate(works):
+            f.write(f"{work['id']},{i % 2}\n")
+
+    with zipfile.ZipFile(Path(p, "works_1.zip"), "w") as z:
+        z.writestr("works_1.json", json.dumps(works))
+
+    return Dataset(name, path=p)
+
+
+def test_export_merged(tmpdir):
+    datasets = [
+        _write_dataset(
+            tmpdir,
+            f"Test_{i}",
+            [
+                {
+                    "id": f"https://openalex.org/W{i}{j}",
+                    "doi": None,
+                    "title": f"Title\n{j}",
+                    "abstract_inverted_index": {"Abstract": [0]},
+                }
+                for j in range(3)
+            ],
+        )
+        for i in range(2)
+    ]
+
+    export_merged(Path(tmpdir, "merged.csv"), datasets)
+
+    with open(Path(tmpdir, "merged.csv"), newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert list(rows[0]) == [
+        "dataset",
+        "openalex_id",
+        "doi",
+        "title",
+        "abstract",
+        "label_included",
+    ]
+    assert [r["dataset"] for r in rows] == ["Test_0"] * 3 + ["Test_1"] * 3
+    assert rows[4]["openalex_id"] == "https://openalex.org/W11"
+    assert rows[4]["title"] == "Title 1"
+    assert rows[4]["abstract"] == "Abstract"
+    assert rows[4]["label_included"] == "1"